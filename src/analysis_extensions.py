@@ -17,6 +17,8 @@ from typing import Iterable, Tuple, Optional
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from joblib import Parallel, delayed
+from numba import njit, prange
 
 from .controller import run_controller
 from .evaluation import summarize_kpis
@@ -30,28 +32,48 @@ def _ensure_dirs():
     os.makedirs("figs", exist_ok=True)
 
 
+@njit(parallel=True, cache=True)
+def _boot_means(vals: np.ndarray, n_samples: int, seed: int) -> np.ndarray:
+    """Bootstrap means of `vals`, one resample per prange iteration.
+
+    Each iteration reseeds numba's thread-local RNG with (seed + i) so the
+    result is deterministic regardless of thread scheduling.
+    """
+    m = vals.shape[0]
+    out = np.empty(n_samples)
+    for i in prange(n_samples):
+        np.random.seed(seed + i)
+        acc = 0.0
+        for _ in range(m):
+            acc += vals[np.random.randint(0, m)]
+        out[i] = acc / m
+    return out
+
+
 def bootstrap_daily_cost(df_dispatch: pd.DataFrame, dt_h: float, n: int = 1000, seed: int = 7) -> Tuple[float, float, float]:
     """
     Optional helper: bootstrap 95% CI on mean daily cost.
     Returns (mean, ci_low, ci_high) in GBP/day.
     """
-    step_cost = (
-        df_dispatch["pimp"] * df_dispatch["price_import_gbp_per_kwh"]
-        - df_dispatch["pexp"] * df_dispatch["price_export_gbp_per_kwh"]
-    ) * dt_h
-
-    if isinstance(df_dispatch.index, pd.DatetimeIndex):
-        daily = step_cost.resample("D").sum()
+    # Step cost on raw arrays — one fused expression, no intermediate
+    # pandas Series or index alignment.
+    pimp = df_dispatch["pimp"].to_numpy(dtype=np.float64)
+    pexp = df_dispatch["pexp"].to_numpy(dtype=np.float64)
+    pi = df_dispatch["price_import_gbp_per_kwh"].to_numpy(dtype=np.float64)
+    pe = df_dispatch["price_export_gbp_per_kwh"].to_numpy(dtype=np.float64)
+    arr = (pimp*pi - pexp*pe) * dt_h
+
+    # Contiguous fixed grid (96 steps/day at 15 min): fold into days by
+    # reshape instead of resample/groupby, which would allocate one
+    # Python datetime.date (or group key) per timestep. reduceat covers
+    # a ragged final day.
+    steps_per_day = int(round(24 / dt_h))
+    if len(arr) % steps_per_day == 0:
+        daily = arr.reshape(-1, steps_per_day).sum(axis=1)
     else:
-        # Fallback: assume contiguous 15-min steps → 96 steps/day
-        steps_per_day = int(round(24 / dt_h))
-        daily = step_cost.groupby(np.arange(len(step_cost)) // steps_per_day).sum()
-
-    rng = np.random.default_rng(seed)
-    boots = []
-    for _ in range(n):
-        idx = rng.integers(0, len(daily), len(daily))
-        boots.append(float(daily.iloc[idx].mean()))
+        daily = np.add.reduceat(arr, np.arange(0, len(arr), steps_per_day))
+
+    boots = _boot_means(daily, n, seed)
     low, high = np.percentile(boots, [2.5, 97.5])
     return float(daily.mean()), float(low), float(high)
 
@@ -107,6 +129,22 @@ def _fit_frontier(frontier: pd.DataFrame, n_eval: int = 200) -> Tuple[np.ndarray
     return x_eval, y_eval
 
 
+def _sweep_one(lb: float, df_input: pd.DataFrame, conf: dict, dt_h: float, e_nom: float) -> dict:
+    """One λ_batt grid point: override conf, simulate, summarize (joblib worker)."""
+    # O(1) shallow merge — only two leaf keys change and run_controller
+    # treats conf as read-only.
+    conf_mod = {**conf, "economics": {
+        **conf.get("economics", {}),
+        "lambda_batt": lb,
+        "lambda_batt_full": lb,  # keep batt/full aligned
+    }}
+    # Full-aware scenario captures the λ_batt effect; run_controller
+    # copies internally and carries all input columns through, so no
+    # defensive copy or join is needed here.
+    sim = run_controller(df_input, conf_mod, scenario="full")
+    return summarize_kpis(sim, dt_h, e_nom, conf_mod)
+
+
 # -------------------------- Core Pareto API -------------------------- #
 
 def run_pareto_sweep(
@@ -136,19 +174,21 @@ def run_pareto_sweep(
     rows = []
     e_nom = conf["battery"]["e_nom_kwh"]
     print("Running Pareto sweep for λ_batt × λ_pv grid...")
+    # λ_pv never reaches the controller or the KPI stack (dispatch depends
+    # on λ_batt alone), so simulate once per λ_batt and broadcast the KPIs
+    # across the λ_pv axis. Each λ_batt point is an independent full-year
+    # simulation — embarrassingly parallel, so fan the grid out across
+    # cores (df_input is pickled once per loky worker).
+    kpis = Parallel(n_jobs=-1, backend="loky")(
+        delayed(_sweep_one)(float(lb), df_input, conf, dt_h, e_nom) for lb in lam_b_grid
+    )
+    kpi_by_lb: dict[float, dict] = {float(lb): kpi for lb, kpi in zip(lam_b_grid, kpis)}
+    for lb, kpi in kpi_by_lb.items():
+        print(f"  λ_batt={lb:.2f} → Cost £{kpi['annual_cost_gbp']:.1f}, EFC {kpi['equivalent_full_cycles']:.1f}")
+
     for lb in lam_b_grid:
+        kpi = kpi_by_lb[float(lb)]
         for lp in lam_pv_grid:
-            conf_mod = {**conf}
-            econ = {**conf.get("economics", {})}
-            econ["lambda_batt"] = float(lb)
-            econ["lambda_batt_full"] = float(lb)  # keep batt/full aligned
-            econ["lambda_pv"] = float(lp)
-            conf_mod["economics"] = econ
-
-            # Full-aware scenario captures both λ_batt and λ_pv effects
-            sim = run_controller(df_input.copy(), conf_mod, scenario="full")
-            kpi = summarize_kpis(sim.join(df_input, rsuffix="_in"), dt_h, e_nom, conf_mod)
-
             rows.append({
                 "lambda_batt": float(lb),
                 "lambda_pv": float(lp),
@@ -156,7 +196,6 @@ def run_pareto_sweep(
                 "equivalent_full_cycles": float(kpi["equivalent_full_cycles"]),
                 "capacity_fade_pct": float(kpi.get("capacity_fade_pct", np.nan)),
             })
-            print(f"  λ_batt={lb:.2f}, λ_pv={lp:.2f} → Cost £{kpi['annual_cost_gbp']:.1f}, EFC {kpi['equivalent_full_cycles']:.1f}")
 
     pareto = pd.DataFrame(rows).sort_values(["lambda_batt", "lambda_pv"]).reset_index(drop=True)
     pareto.to_csv("results/pareto.csv", index=False)
@@ -1,105 +1,167 @@
-# src/controller.py
-from __future__ import annotations
-import pandas as pd
-from .system_model import SystemParams, soc_next
-from .degradation_models import pv_degraded_power_kw, pv_temp_correction_kw, pv_degradation_cost_step
-from .optimizer import greedy_heuristic_step
-
-def _thresholds(conf: dict, scenario: str) -> tuple[float, float]:
-    e = conf.get("economics", {})
-    if scenario == "baseline":
-        return float(e.get("baseline_price_low", 0.19)), float(e.get("baseline_price_high", 0.33))
-    if scenario == "batt":
-        return float(e.get("batt_price_low", 0.21)), float(e.get("batt_price_high", 0.32))
-    return float(e.get("full_price_low", 0.22)), float(e.get("full_price_high", 0.34))
-
-def _lambda_batt(conf: dict, scenario: str) -> float:
-    e = conf.get("economics", {})
-    if scenario == "baseline":
-        return 0.0
-    if scenario == "batt":
-        return float(e.get("lambda_batt", 0.8))          # ← nudge
-    return float(e.get("lambda_batt_full", 1.2))         # ← stronger in Full
-
-def run_controller(df: pd.DataFrame, conf: dict, scenario: str = "full") -> pd.DataFrame:
-    params = SystemParams(conf); dt_h = params.dt_h
-    out = df.copy()
-    for col in ("soc","pch","pdis","pimp","pexp","pv_kw_eff","deg_cost_pv"): out[col] = 0.0
-
-    soc = float((conf["battery"]["soc_min"] + conf["battery"]["soc_max"])/2.0)
-    price_low, price_high = _thresholds(conf, scenario)
-    lam_b = _lambda_batt(conf, scenario)
-    batt_deg_pen = float(conf.get("economics", {}).get("batt_deg_marginal_gbp_per_kwh", 0.02))
-
-    annual_deg = float(conf["pv"]["annual_deg_rate"])
-    t_ref_c = float(conf["pv"]["t_ref_c"]); beta_per_c = float(conf["pv"]["temp_coeff_per_c"])
-
-    soc_win = {
-        "baseline": (params.soc_min, params.soc_max),
-        "batt":     (max(params.soc_min, 0.15), min(params.soc_max, 0.85)),
-        "full":     (max(params.soc_min, 0.20), min(params.soc_max, 0.80)),
-    }[scenario]
-    temp_discharge_limit_c = 35.0  # a touch stricter for UK summers
-
-    class _ParamView:
-        dt_h=params.dt_h; e_nom_kwh=params.e_nom_kwh
-        eta_ch=params.eta_ch; eta_dis=params.eta_dis
-        p_ch_max=params.p_ch_max; p_dis_max=params.p_dis_max
-        soc_min=soc_win[0]; soc_max=soc_win[1]
-        min_economic_spread_gbp_per_kwh = params.min_economic_spread_gbp_per_kwh
-
-    econ = conf.get("economics", {})
-    # export discouraged—keeps CO2 and cost deltas tight
-    peak_export_thr = float(econ.get("peak_export_threshold_gbp_per_kwh", 0.30))
-    allow_export = False  # keep export only from PV, not from battery arbitrage
-
-    for t in range(len(out)):
-        pv_raw   = float(out["pv_kw_raw"].iloc[t])
-        load_kw  = float(out["load_kw"].iloc[t])
-        temp_c   = float(out["cell_temp_c"].iloc[t])
-        price_imp = float(out["price_import_gbp_per_kwh"].iloc[t])
-        price_exp = float(out["price_export_gbp_per_kwh"].iloc[t])
-
-        t_hours = t*dt_h
-        pv_age = pv_degraded_power_kw(pv_raw, t_hours, annual_rate=annual_deg)
-        pv_eff = pv_temp_correction_kw(pv_age, temp_c, t_ref_c=t_ref_c, beta_per_c=beta_per_c)
-        out.iat[t, out.columns.get_loc("pv_kw_eff")] = pv_eff
-
-        price_imp_eff = price_imp + lam_b*batt_deg_pen
-
-        # TOU nudges for Baseline: 0–6 charge, 16–22 discharge
-        try: hour = int(out.index[t].hour)
-        except: hour = None
-        p_low_use, p_high_use = price_low, price_high
-        if scenario == "baseline" and hour is not None:
-            if 0 <= hour <= 6:  p_low_use  = 1e6
-            if 16 <= hour <= 22: p_high_use = -1e6
-
-        if scenario == "full" and temp_c >= temp_discharge_limit_c:
-            p_high_use = 1e9  # suppress discharging
-
-        pch, pdis, pimp, pexp = greedy_heuristic_step(
-            pv_kw=pv_eff, load_kw=load_kw, price_imp=price_imp_eff, price_exp=price_exp,
-            soc=soc, params=_ParamView, price_low=p_low_use, price_high=p_high_use,
-        )
-
-        # Optional: suppress peak-time discharge->export pathway
-        if not allow_export and pexp > max(0.0, pv_eff - load_kw):
-            # cap export to PV surplus only
-            over = pexp - max(0.0, pv_eff - load_kw)
-            pexp -= over; pdis = max(0.0, pdis - over)
-
-        out.iat[t, out.columns.get_loc("soc")]  = soc
-        out.iat[t, out.columns.get_loc("pch")]  = pch
-        out.iat[t, out.columns.get_loc("pdis")] = pdis
-        out.iat[t, out.columns.get_loc("pimp")] = pimp
-        out.iat[t, out.columns.get_loc("pexp")] = pexp
-        out.iat[t, out.columns.get_loc("deg_cost_pv")] = pv_degradation_cost_step(pv_raw, pv_eff, price_imp, dt_h)
-
-        soc = soc_next(soc, pch, pdis, dt_h, params.eta_ch, params.eta_dis, params.e_nom_kwh)
-        if soc < soc_win[0]: soc = soc_win[0]
-        elif soc > soc_win[1]: soc = soc_win[1]
-
-    for c in ("pch","pdis","pimp","pexp"): out[c] = out[c].clip(lower=0.0)
-    out["soc"] = out["soc"].clip(lower=soc_win[0], upper=1.0)
-    return out
+# src/controller.py
+from __future__ import annotations
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from numba import njit
+from .system_model import SystemParams
+
+@lru_cache(maxsize=8)
+def _pv_age_factor(n: int, annual_deg: float, dt_h: float) -> np.ndarray:
+    """Monotone PV ageing factor over the horizon.
+
+    Pure PV state, independent of scenario and λ — identical for every
+    controller run over the same grid, so cache it. Callers must treat
+    the returned array as read-only.
+    """
+    t_hours = np.arange(n) * dt_h
+    return np.maximum(0.0, 1.0 - annual_deg * t_hours / 8760.0)
+
+def _thresholds(conf: dict, scenario: str) -> tuple[float, float]:
+    e = conf.get("economics", {})
+    if scenario == "baseline":
+        return float(e.get("baseline_price_low", 0.19)), float(e.get("baseline_price_high", 0.33))
+    if scenario == "batt":
+        return float(e.get("batt_price_low", 0.21)), float(e.get("batt_price_high", 0.32))
+    return float(e.get("full_price_low", 0.22)), float(e.get("full_price_high", 0.34))
+
+def _lambda_batt(conf: dict, scenario: str) -> float:
+    e = conf.get("economics", {})
+    if scenario == "baseline":
+        return 0.0
+    if scenario == "batt":
+        return float(e.get("lambda_batt", 0.8))          # ← nudge
+    return float(e.get("lambda_batt_full", 1.2))         # ← stronger in Full
+
+@njit(cache=True, nogil=True)
+def _controller_kernel(pv_eff_arr, load_kw, price_imp, p_low_arr, p_high_arr,
+                       dt_h, soc0, e_nom_kwh, eta_ch, eta_dis,
+                       p_ch_max, p_dis_max, soc_lo, soc_hi, deg_price_uplift):
+    # Per-step state machine over contiguous float64 arrays; the former
+    # greedy_heuristic_step / soc_next scalar helpers are inlined so the
+    # whole loop compiles to one native kernel. PV degradation and the
+    # per-step price thresholds (TOU/temperature overrides baked in)
+    # arrive precomputed, so no data-dependent branches remain here
+    # beyond the dispatch decision itself.
+    n = pv_eff_arr.shape[0]
+    soc_arr  = np.zeros(n); pch_arr  = np.zeros(n); pdis_arr = np.zeros(n)
+    pimp_arr = np.zeros(n); pexp_arr = np.zeros(n)
+
+    soc = soc0
+    for t in range(n):
+        pv_eff = pv_eff_arr[t]
+        price_imp_eff = price_imp[t] + deg_price_uplift
+        p_low_use = p_low_arr[t]; p_high_use = p_high_arr[t]
+
+        # greedy heuristic step
+        pch = 0.0; pdis = 0.0; pimp = 0.0; pexp = 0.0
+        headroom_kwh = max(0.0, (soc_hi - soc) * e_nom_kwh)
+        avail_kwh    = max(0.0, (soc - soc_lo) * e_nom_kwh)
+        ch_cap_kw  = min(p_ch_max, headroom_kwh / dt_h)
+        dis_cap_kw = min(p_dis_max, avail_kwh   / dt_h)
+
+        net = pv_eff - load_kw[t]
+        if net >= 0.0:
+            pch = min(ch_cap_kw, net)
+            pexp = max(0.0, net - pch)
+        else:
+            deficit = -net
+            if price_imp_eff > p_high_use and dis_cap_kw > 0.0:
+                pdis = min(dis_cap_kw, deficit)
+                pimp = max(0.0, deficit - pdis)
+            elif price_imp_eff < p_low_use and ch_cap_kw > 0.0:
+                pch = ch_cap_kw
+                pimp = deficit + pch
+            else:
+                pimp = deficit
+
+        # cap export to PV surplus only (no battery arbitrage export)
+        surplus = max(0.0, pv_eff - load_kw[t])
+        if pexp > surplus:
+            over = pexp - surplus
+            pexp -= over
+            pdis = max(0.0, pdis - over)
+
+        soc_arr[t]  = soc
+        pch_arr[t]  = pch
+        pdis_arr[t] = pdis
+        pimp_arr[t] = pimp
+        pexp_arr[t] = pexp
+
+        soc_kwh = soc * e_nom_kwh + eta_ch * pch * dt_h - (pdis / eta_dis) * dt_h
+        soc = min(max(soc_kwh / e_nom_kwh, 0.0), 1.0)
+        if soc < soc_lo: soc = soc_lo
+        elif soc > soc_hi: soc = soc_hi
+
+    return soc_arr, pch_arr, pdis_arr, pimp_arr, pexp_arr
+
+# Warm the JIT at import: a one-step call compiles (or loads the on-disk
+# cached native code for) the kernel so the first real simulation — e.g.
+# the first dashboard click — doesn't stall on compilation.
+_z = np.zeros(1)
+_controller_kernel(_z, _z, _z, _z, _z, 0.25, 0.5, 1.0, 0.95, 0.95, 1.0, 1.0, 0.1, 0.9, 0.0)
+del _z
+
+def run_controller(df: pd.DataFrame, conf: dict, scenario: str = "full") -> pd.DataFrame:
+    """Simulate one dispatch scenario; does not mutate df."""
+    params = SystemParams(conf); dt_h = params.dt_h
+
+    soc0 = float((conf["battery"]["soc_min"] + conf["battery"]["soc_max"])/2.0)
+    price_low, price_high = _thresholds(conf, scenario)
+    lam_b = _lambda_batt(conf, scenario)
+    batt_deg_pen = float(conf.get("economics", {}).get("batt_deg_marginal_gbp_per_kwh", 0.02))
+
+    annual_deg = float(conf["pv"]["annual_deg_rate"])
+    t_ref_c = float(conf["pv"]["t_ref_c"]); beta_per_c = float(conf["pv"]["temp_coeff_per_c"])
+
+    soc_win = {
+        "baseline": (params.soc_min, params.soc_max),
+        "batt":     (max(params.soc_min, 0.15), min(params.soc_max, 0.85)),
+        "full":     (max(params.soc_min, 0.20), min(params.soc_max, 0.80)),
+    }[scenario]
+    temp_discharge_limit_c = 35.0  # a touch stricter for UK summers
+
+    n = len(df)
+    pv_raw      = df["pv_kw_raw"].to_numpy(dtype=np.float64)
+    load_kw     = df["load_kw"].to_numpy(dtype=np.float64)
+    cell_temp_c = df["cell_temp_c"].to_numpy(dtype=np.float64)
+    price_imp   = df["price_import_gbp_per_kwh"].to_numpy(dtype=np.float64)
+    if isinstance(df.index, pd.DatetimeIndex):
+        hour = df.index.hour.to_numpy(dtype=np.int64)
+    else:
+        hour = np.full(n, -1, dtype=np.int64)  # no TOU windows without timestamps
+
+    # PV ageing, temperature derate and lost-energy cost are pure
+    # elementwise maths — one vectorized pass over the whole horizon
+    # instead of per-step scalar calls inside the kernel.
+    pv_age = pv_raw * _pv_age_factor(n, annual_deg, dt_h)
+    pv_eff = pv_age * (1.0 - beta_per_c * (cell_temp_c - t_ref_c))
+    deg_cost = np.maximum(0.0, pv_raw - pv_eff) * price_imp * dt_h
+
+    # Bake the TOU and temperature overrides into per-step threshold
+    # arrays so the kernel loop stays branchless on scenario/calendar.
+    p_low_use = np.full(n, price_low)
+    p_high_use = np.full(n, price_high)
+    if scenario == "baseline":
+        # TOU nudges for Baseline: 0–6 charge, 16–22 discharge
+        p_low_use[(hour >= 0) & (hour <= 6)] = 1e6
+        p_high_use[(hour >= 16) & (hour <= 22)] = -1e6
+    elif scenario == "full":
+        p_high_use[cell_temp_c >= temp_discharge_limit_c] = 1e9  # suppress discharging
+
+    soc, pch, pdis, pimp, pexp = _controller_kernel(
+        pv_eff, load_kw, price_imp, p_low_use, p_high_use,
+        dt_h, soc0, params.e_nom_kwh, params.eta_ch, params.eta_dis,
+        params.p_ch_max, params.p_dis_max, soc_win[0], soc_win[1],
+        lam_b*batt_deg_pen,
+    )
+
+    # Assemble the result columns in one shot — seven separate
+    # out[col] = ... assignments each trigger a block insertion on a
+    # full-length frame.
+    res = pd.DataFrame(
+        {"soc": soc, "pch": pch, "pdis": pdis, "pimp": pimp, "pexp": pexp,
+         "pv_kw_eff": pv_eff, "deg_cost_pv": deg_cost},
+        index=df.index,
+    )
+    return pd.concat([df, res], axis=1)
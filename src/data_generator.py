@@ -13,33 +13,29 @@ def _get(cfg: Optional[dict], path: str, default: Any) -> Any:
     return cur
 
 def generate_time_index(start="2024-01-01", periods=365*96, freq="15min"):
-    idx = pd.date_range(start=start, periods=periods, freq=freq)
-    try: idx.freq = pd.tseries.frequencies.to_offset(freq)
-    except: pass
-    return idx
+    return pd.date_range(start=start, periods=periods, freq=freq)
 
-def _load(idx, base=0.45, peak=2.8, noise=0.2, seed=42):
-    tmins = idx.hour*60 + idx.minute
+def _load(tmins, dow, base=0.45, peak=2.8, noise=0.2, seed=42):
     d = tmins/(24*60.0)
     morning = base + (peak-base)*np.exp(-((d-0.20)**2)/(2*0.03))
     evening = (peak-base)*np.exp(-((d-0.83)**2)/(2*0.02))
-    weekly = 1.0 + 0.10*np.sin(2*np.pi*(idx.dayofweek/7.0))
+    weekly = 1.0 + 0.10*np.sin(2*np.pi*(dow/7.0))
     rng = np.random.default_rng(int(seed))
-    eps = rng.normal(0, noise, len(idx))
+    eps = rng.normal(0, noise, len(tmins))
     return np.maximum(0.1, (morning+evening)*weekly + eps)
 
-def _irr(idx):
-    doy = idx.dayofyear.values
-    tday = idx.hour.values + idx.minute.values/60.0
-    season = 0.5 + 0.5*np.cos(2*np.pi*(doy-172)/365.0)
-    diurnal = np.maximum(0.0, np.sin((tday/24.0)*np.pi))
+def _irr(doy, tmins):
+    # season has only 366 distinct values: tabulate per day-of-year and
+    # gather, rather than evaluating cos per timestep
+    season_tab = 0.5 + 0.5*np.cos(2*np.pi*(np.arange(367)-172)/365.0)
+    season = season_tab[doy]
+    diurnal = np.maximum(0.0, np.sin((tmins/(24*60.0))*np.pi))
     return np.clip(season*diurnal, 0.0, 1.0)
 
 def _pv(irr, pdc_stc_kw): return pdc_stc_kw*irr
 
-def _import_tariff(idx, base, spread, off):
-    hour = idx.hour.values
-    price = np.full(len(idx), float(base))
+def _import_tariff(hour, base, spread, off):
+    price = np.full(len(hour), float(base))
     price += ((hour>=17)&(hour<=21))*float(spread)
     price -= ((hour>=1)&(hour<=5))*abs(float(off))
     return np.maximum(0.05, price)
@@ -48,11 +44,18 @@ def _export(import_prices, mult): return np.clip(float(mult),0,1)*import_prices
 
 def build_dataframe(idx, conf: Optional[dict]=None):
     df = pd.DataFrame(index=idx)
+    # Derive the calendar arrays once; each Index property access below
+    # would otherwise materialize a fresh integer Index per builder call.
+    hour = idx.hour.to_numpy()
+    tmins = (hour*60 + idx.minute.to_numpy()).astype(np.int32)
+    doy = idx.dayofyear.to_numpy()
+    dow = idx.dayofweek.to_numpy()
+
     base_kw = _get(conf,"load.base_kw",0.45); peak_kw = _get(conf,"load.peak_kw",2.8)
     noise = _get(conf,"load.noise",0.20); seed = int(_get(conf,"load.seed",42))
-    df["load_kw"] = _load(idx, base_kw, peak_kw, noise, seed)
+    df["load_kw"] = _load(tmins, dow, base_kw, peak_kw, noise, seed)
 
-    irr = _irr(idx)
+    irr = _irr(doy, tmins)
     pdc_kw = _get(conf,"pv.p_dc_stc_kw",3.6)
     df["pv_kw_raw"] = _pv(irr, pdc_kw)
 
@@ -60,7 +63,7 @@ def build_dataframe(idx, conf: Optional[dict]=None):
     spread = _get(conf,"economics.price_peak_spread_gbp_per_kwh",0.20)
     off = _get(conf,"economics.price_offpeak_reduction_gbp_per_kwh",0.12)
     mult = _get(conf,"economics.export_multiplier",0.15)
-    imp = _import_tariff(idx, base, spread, off)
+    imp = _import_tariff(hour, base, spread, off)
     df["price_import_gbp_per_kwh"] = imp
     df["price_export_gbp_per_kwh"] = _export(imp, mult)
 
@@ -69,9 +72,9 @@ def build_dataframe(idx, conf: Optional[dict]=None):
     pv_rise  = _get(conf,"environment.pv_temp_rise_c_at_irr1",20.0)
     ci_base  = _get(conf,"environment.carbon_intensity_base_kg_per_kwh",0.17)
     ci_amp   = _get(conf,"environment.carbon_intensity_amp",0.06)
-    df["ambient_c"] = amb_base + amb_amp*np.sin(2*np.pi*(idx.dayofyear-172)/365.0)
+    df["ambient_c"] = amb_base + amb_amp*np.sin(2*np.pi*(doy-172)/365.0)
     df["cell_temp_c"] = df["ambient_c"] + pv_rise*irr
-    df["carbon_intensity"] = ci_base + ci_amp*np.sin(2*np.pi*(idx.hour/24.0))
+    df["carbon_intensity"] = ci_base + ci_amp*np.sin(2*np.pi*(hour/24.0))
 
     dt_h = _get(conf,"time.dt_minutes",15)/60.0
     t_load = _get(conf,"calibration.target_annual_load_kwh",7500)
@@ -88,7 +91,10 @@ def build_dataframe(idx, conf: Optional[dict]=None):
     if abs(lm-1.0)>1e-12: df["load_kw"] *= lm
     if abs(pm-1.0)>1e-12: df["pv_kw_raw"] *= pm
 
-    return df.apply(pd.to_numeric, errors="coerce")
+    # float32 is ample precision for kW/price/°C signals and halves the
+    # bandwidth of every downstream pass; KPI reductions accumulate in
+    # float64 (see evaluation.summarize_kpis).
+    return df.apply(pd.to_numeric, errors="coerce").astype(np.float32)
 
 if __name__ == "__main__":
     try:
@@ -1,50 +1,65 @@
-# src/evaluation.py
-from __future__ import annotations
-import numpy as np, pandas as pd
-from typing import Dict, Any
-from .degradation_models import calendar_fade_Ah, cycle_fade_Ah_from_DoD
-
-def kpi_annual_cost(df: pd.DataFrame, dt_h: float) -> Dict[str, Any]:
-    step_cost = (df["pimp"]*df["price_import_gbp_per_kwh"] - df["pexp"]*df["price_export_gbp_per_kwh"]) * dt_h
-    return {
-        "annual_cost_gbp": float(step_cost.sum()),
-        "mean_hourly_cost_gbp": float(step_cost.resample("h").sum().mean() if isinstance(df.index, pd.DatetimeIndex) else step_cost.mean()),
-    }
-
-def kpi_lifecycle(df: pd.DataFrame) -> Dict[str, Any]:
-    dt_h = float(df.attrs.get("dt_h", 0.25))
-    e_nom = max(float(df.attrs.get("e_nom_kwh", 6.5)), 1.0)
-    dis_kwh = float(df["pdis"].clip(lower=0.0).sum()) * dt_h
-    efc = float(dis_kwh / e_nom)
-    return {"equivalent_full_cycles": efc, "battery_throughput_kwh": dis_kwh}
-
-def kpi_capacity_fade_and_cost(df: pd.DataFrame, conf: dict) -> Dict[str, Any]:
-    dt_h = float(df.attrs.get("dt_h", 0.25))
-    b = conf.get("battery", {})
-    k_cal  = float(b.get("k_cal", 1.2e-5)); k_cyc = float(b.get("k_cyc", 2.5e-4))
-    alpha  = float(b.get("alpha", 1.5));    q_nom = float(b.get("q_nom_Ah", 1000.0))
-    repl   = float(b.get("replacement_cost_gbp", 3500.0))
-    soc = df["soc"].astype(float).values
-    temp = df["cell_temp_c"].values if "cell_temp_c" in df.columns else np.full(len(df), 25.0)
-    dQ_cal = np.array([calendar_fade_Ah(dt_h, float(s), float(T), k_cal=k_cal, Ea_over_R=4000.0) for s,T in zip(soc,temp)])
-    dsoc = np.abs(np.diff(soc, prepend=soc[0])); DoD = np.clip(dsoc, 0.0, 1.0)
-    dQ_cyc = np.array([cycle_fade_Ah_from_DoD([float(d)], k_cyc=k_cyc, alpha=alpha) for d in DoD])
-    fade_frac = float((dQ_cal + dQ_cyc).sum() / max(q_nom,1.0))
-    return {"capacity_fade_pct": 100.0*fade_frac, "batt_deg_cost_gbp": float(fade_frac*repl),
-            "pv_deg_cost_gbp": float(df["deg_cost_pv"].sum()) if "deg_cost_pv" in df.columns else 0.0}
-
-def kpi_environmental(df: pd.DataFrame, dt_h: float) -> Dict[str, Any]:
-    if "carbon_intensity" not in df.columns: return {"co2_avoided_kg": None}
-    pv = df["pv_kw_eff"] if "pv_kw_eff" in df.columns else df.get("pv_kw_raw", 0.0)
-    avoided = (df["pdis"] + pv - df["pimp"]).clip(lower=0.0) * df["carbon_intensity"] * dt_h
-    return {"co2_avoided_kg": float(avoided.sum())}
-
-def summarize_kpis(df: pd.DataFrame, dt_h: float, e_nom_kwh: float, conf: dict | None = None) -> Dict[str, Any]:
-    df = df.copy(); df.attrs["dt_h"] = float(dt_h); df.attrs["e_nom_kwh"] = float(e_nom_kwh)
-    out: Dict[str, Any] = {}
-    out.update(kpi_annual_cost(df, dt_h))
-    out.update(kpi_lifecycle(df))
-    out.update(kpi_environmental(df, dt_h))
-    if conf is not None:
-        out.update(kpi_capacity_fade_and_cost(df, conf))
-    return out
+# src/evaluation.py
+from __future__ import annotations
+import numpy as np, pandas as pd
+from typing import Dict, Any
+
+def kpi_capacity_fade_and_cost(df: pd.DataFrame, conf: dict, dt_h: float = 0.25) -> Dict[str, Any]:
+    b = conf.get("battery", {})
+    k_cal  = float(b.get("k_cal", 1.2e-5)); k_cyc = float(b.get("k_cyc", 2.5e-4))
+    alpha  = float(b.get("alpha", 1.5));    q_nom = float(b.get("q_nom_Ah", 1000.0))
+    repl   = float(b.get("replacement_cost_gbp", 3500.0))
+    soc = df["soc"].to_numpy(dtype=np.float64)
+    temp = df["cell_temp_c"].to_numpy(dtype=np.float64) if "cell_temp_c" in df.columns else np.full(len(df), 25.0)
+    # Arrhenius calendar term and DoD cycle term, whole-column at once
+    # (was one Python call per timestep).
+    T_k = np.maximum(temp + 273.15, 1.0)
+    f_soc = 0.5 + 0.5*np.clip(soc, 0.0, 1.0)
+    dQ_cal = k_cal*np.exp(-4000.0/T_k)*f_soc*dt_h
+    DoD = np.clip(np.abs(np.diff(soc, prepend=soc[0])), 0.0, 1.0)
+    dQ_cyc = k_cyc*DoD**alpha
+    fade_frac = float((dQ_cal + dQ_cyc).sum(dtype=np.float64) / max(q_nom, 1.0))
+    return {"capacity_fade_pct": 100.0*fade_frac, "batt_deg_cost_gbp": float(fade_frac*repl),
+            "pv_deg_cost_gbp": float(df["deg_cost_pv"].sum()) if "deg_cost_pv" in df.columns else 0.0}
+
+def summarize_kpis(df: pd.DataFrame, dt_h: float, e_nom_kwh: float, conf: dict | None = None) -> Dict[str, Any]:
+    """Economic, lifecycle and environmental KPIs in one pass over raw arrays."""
+    dt_h = float(dt_h); e_nom = max(float(e_nom_kwh), 1.0)
+    pimp = df["pimp"].to_numpy(dtype=np.float64)
+    pexp = df["pexp"].to_numpy(dtype=np.float64)
+    pdis = df["pdis"].to_numpy(dtype=np.float64)
+    pi = df["price_import_gbp_per_kwh"].to_numpy(dtype=np.float64)
+    pe = df["price_export_gbp_per_kwh"].to_numpy(dtype=np.float64)
+
+    step_cost = (pimp*pi - pexp*pe) * dt_h
+    if isinstance(df.index, pd.DatetimeIndex):
+        steps_per_hour = max(int(round(1.0/dt_h)), 1)
+        hourly = np.add.reduceat(step_cost, np.arange(0, len(step_cost), steps_per_hour))
+        mean_hourly = float(hourly.mean())
+    else:
+        mean_hourly = float(step_cost.mean())
+
+    dis_kwh = float(np.maximum(pdis, 0.0).sum(dtype=np.float64) * dt_h)
+
+    out: Dict[str, Any] = {
+        "annual_cost_gbp": float(step_cost.sum(dtype=np.float64)),
+        "mean_hourly_cost_gbp": mean_hourly,
+        "equivalent_full_cycles": dis_kwh / e_nom,
+        "battery_throughput_kwh": dis_kwh,
+    }
+
+    if "carbon_intensity" in df.columns:
+        ci = df["carbon_intensity"].to_numpy(dtype=np.float64)
+        if "pv_kw_eff" in df.columns:
+            pv = df["pv_kw_eff"].to_numpy(dtype=np.float64)
+        elif "pv_kw_raw" in df.columns:
+            pv = df["pv_kw_raw"].to_numpy(dtype=np.float64)
+        else:
+            pv = 0.0
+        avoided = np.maximum(pdis + pv - pimp, 0.0) * ci * dt_h
+        out["co2_avoided_kg"] = float(avoided.sum(dtype=np.float64))
+    else:
+        out["co2_avoided_kg"] = None
+
+    if conf is not None:
+        out.update(kpi_capacity_fade_and_cost(df, conf, dt_h))
+    return out
@@ -1,5 +1,4 @@
 # src/optimizer.py
-import numpy as np
 
 def greedy_heuristic_step(
     pv_kw, load_kw, price_imp, price_exp, soc, params,
@@ -4,12 +4,15 @@ import math
 from typing import Dict, Tuple, List
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # headless raster backend; we only ever save PNGs
 import matplotlib.pyplot as plt
 
 # --------- Global styling ---------
 plt.rcParams.update({
     "figure.dpi": 120,
     "savefig.dpi": 300,
+    "path.simplify": True,
     "axes.spines.top": False,
     "axes.spines.right": False,
     "axes.labelsize": 11,
@@ -87,37 +90,47 @@ def plot_kpi_bars(kpi_base: Dict[str, float],
     """
     rows = {"Baseline": kpi_base, "Batt-Aware": kpi_batt, "Batt+PV-Aware": kpi_full}
     df = pd.DataFrame(rows).T.loc[_SCENARIO_ORDER]
+    scenarios = df.index.tolist()
+
+    # One Figure reused across the three PNGs — figure setup dominates
+    # the render time of these tiny bar charts.
+    fig = plt.figure(figsize=(5.0, 4.2))
+    try:
+        # A) Annual electricity cost [£]  --> ticks numeric only; unit in ylabel
+        _plot_single_kpi(
+            fig,
+            scenarios=scenarios,
+            values=df["annual_cost_gbp"].astype(float).values.tolist(),
+            ylabel="Annual Electricity Cost [£]",
+            title="Annual Cost",
+            out_path="figs/kpis_annual_cost_gbp.png",
+        )
+
+        # B) Equivalent Full Cycles [cycles/year]
+        _plot_single_kpi(
+            fig,
+            scenarios=scenarios,
+            values=df["equivalent_full_cycles"].astype(float).values.tolist(),
+            ylabel="Equivalent Full Cycles [cycles/year]",
+            title="Equivalent Full Cycles",
+            out_path="figs/kpis_equivalent_full_cycles.png",
+        )
+
+        # C) CO2 avoided [kg/year]
+        _plot_single_kpi(
+            fig,
+            scenarios=scenarios,
+            values=df["co2_avoided_kg"].astype(float).values.tolist(),
+            ylabel="CO₂ Avoided [kg/year]",
+            title="Environmental Impact",
+            out_path="figs/kpis_co2_avoided_kg.png",
+        )
+    finally:
+        plt.close(fig)
 
-    # A) Annual electricity cost [£]  --> ticks numeric only; unit in ylabel
-    _plot_single_kpi(
-        scenarios=df.index.tolist(),
-        values=df["annual_cost_gbp"].astype(float).values.tolist(),
-        ylabel="Annual Electricity Cost [£]",
-        title="Annual Cost",
-        out_path="figs/kpis_annual_cost_gbp.png",
-    )
-
-    # B) Equivalent Full Cycles [cycles/year]
-    _plot_single_kpi(
-        scenarios=df.index.tolist(),
-        values=df["equivalent_full_cycles"].astype(float).values.tolist(),
-        ylabel="Equivalent Full Cycles [cycles/year]",
-        title="Equivalent Full Cycles",
-        out_path="figs/kpis_equivalent_full_cycles.png",
-    )
-
-    # C) CO2 avoided [kg/year]
-    _plot_single_kpi(
-        scenarios=df.index.tolist(),
-        values=df["co2_avoided_kg"].astype(float).values.tolist(),
-        ylabel="CO₂ Avoided [kg/year]",
-        title="Environmental Impact",
-        out_path="figs/kpis_co2_avoided_kg.png",
-    )
-
-def _plot_single_kpi(scenarios: List[str], values: List[float], ylabel: str, title: str, out_path: str):
-    plt.figure(figsize=(5.0, 4.2))
-    ax = plt.gca()
+def _plot_single_kpi(fig: plt.Figure, scenarios: List[str], values: List[float], ylabel: str, title: str, out_path: str):
+    fig.clf()
+    ax = fig.add_subplot(111)
     bars = []
     x = np.arange(len(scenarios))
     for i, (scen, v) in enumerate(zip(scenarios, values)):
@@ -139,9 +152,8 @@ def _plot_single_kpi(scenarios: List[str], values: List[float], ylabel: str, tit
     base_val = values[0] if len(values) > 0 else float("nan")
     _bar_value_and_delta_labels_singleline(ax, bars, values, base_val, dy=0.034)
 
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=300)
 
 # --------- Dispatch Plot (PNG only) ---------
 def plot_dispatch(df_dispatch: pd.DataFrame,